@@ -6,9 +6,62 @@ This module provides utilities for loading and validating JSON configuration fil
 that control the behavior of the water obstacle modeling pipeline.
 """
 
+import copy
 import json
+import mmap
 import os
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Tuple, Union
+
+# orjson parses considerably faster than the standard library; fall back to
+# json when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Required keys of each required configuration section, in validation order
+REQUIRED_KEYS: Dict[str, Tuple[str, ...]] = {
+    'water_features': ('polygon_types', 'line_types', 'min_area_sqm'),
+    'buffer_sizes': ('default',),
+    'crossability': ('default',),
+    'terrain_grid': ('cell_size', 'connection_distance'),
+    'environmental_conditions': ('rainfall', 'snow_depth', 'temperature'),
+}
+
+# Parsed configuration files, keyed by absolute path, with the modification
+# time and size they were parsed at
+_CONFIG_CACHE: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+
+
+def _load_config(config_path: str) -> Dict[str, Any]:
+    """
+    Load a JSON configuration file, parsing it at most once per change.
+    
+    Args:
+        config_path: Path to the JSON configuration file
+    
+    Returns:
+        A copy of the parsed configuration, safe for the caller to modify
+    """
+    path = os.path.abspath(config_path)
+    stat = os.stat(path)
+    
+    cached = _CONFIG_CACHE.get(path)
+    if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+        with open(path, 'rb') as f:
+            if orjson is not None and stat.st_size:
+                # Parse straight from the mapped file, without copying it
+                # into a bytes object first
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    with memoryview(mapped) as view:
+                        config = orjson.loads(view)
+            else:
+                config = json.loads(f.read())
+        cached = (stat.st_mtime_ns, stat.st_size, config)
+        _CONFIG_CACHE[path] = cached
+    
+    return copy.deepcopy(cached[2])
 
 
 class ConfigLoader:
@@ -28,8 +81,7 @@ class ConfigLoader:
         if not os.path.exists(config_path):
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
         
-        with open(config_path, 'r') as f:
-            self.config = json.load(f)
+        self.config = _load_config(config_path)
         
         self.validate_config()
     
@@ -40,52 +92,15 @@ class ConfigLoader:
         Raises:
             ValueError: If required sections or keys are missing
         """
-        required_sections = [
-            'water_features', 
-            'buffer_sizes', 
-            'crossability', 
-            'terrain_grid', 
-            'environmental_conditions'
-        ]
-        
-        for section in required_sections:
+        for section in REQUIRED_KEYS:
             if section not in self.config:
                 raise ValueError(f"Missing required configuration section: {section}")
         
-        # Validate water_features section
-        water_features = self.config['water_features']
-        required_water_keys = ['polygon_types', 'line_types', 'min_area_sqm']
-        for key in required_water_keys:
-            if key not in water_features:
-                raise ValueError(f"Missing required key in water_features: {key}")
-        
-        # Validate buffer_sizes section
-        buffer_sizes = self.config['buffer_sizes']
-        required_buffer_keys = ['default']
-        for key in required_buffer_keys:
-            if key not in buffer_sizes:
-                raise ValueError(f"Missing required key in buffer_sizes: {key}")
-        
-        # Validate crossability section
-        crossability = self.config['crossability']
-        required_cross_keys = ['default']
-        for key in required_cross_keys:
-            if key not in crossability:
-                raise ValueError(f"Missing required key in crossability: {key}")
-        
-        # Validate terrain_grid section
-        terrain_grid = self.config['terrain_grid']
-        required_terrain_keys = ['cell_size', 'connection_distance']
-        for key in required_terrain_keys:
-            if key not in terrain_grid:
-                raise ValueError(f"Missing required key in terrain_grid: {key}")
-        
-        # Validate environmental_conditions section
-        env_conditions = self.config['environmental_conditions']
-        required_env_keys = ['rainfall', 'snow_depth', 'temperature']
-        for key in required_env_keys:
-            if key not in env_conditions:
-                raise ValueError(f"Missing required key in environmental_conditions: {key}")
+        for section, required_keys in REQUIRED_KEYS.items():
+            values = self.config[section]
+            for key in required_keys:
+                if key not in values:
+                    raise ValueError(f"Missing required key in {section}: {key}")
     
     def get_value(self, section: str, key: str, default: Optional[Any] = None) -> Any:
         """
@@ -12,12 +12,16 @@ This script:
 import os
 import sys
 import argparse
+import functools
+import hashlib
 import logging
+import re
 import time
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 import psycopg2
+from psycopg2 import sql as pgsql
 from psycopg2.extras import DictCursor
 
 # Add the parent directory to the path so we can import config_loader
@@ -36,6 +40,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger('water_obstacle_pipeline')
 
+# A :name parameter placeholder, but not the second colon of a :: cast
+SQL_PARAM_PATTERN = re.compile(r"(?<!:):(\w+)")
+
+# Step 07 (re)applies the environmental conditions, which other scripts change
+# between pipeline runs, so it is never skipped as unchanged
+UNCACHED_STEPS = ["07"]
+
+# The table each cacheable step builds; a step is only skipped while the
+# table it recorded is still there and has rows
+STAGE_OUTPUT_TABLES = {
+    "01_extract_water_features.sql": "water_features",
+    "02_create_water_buffers.sql": "water_buf",
+    "03_dissolve_water_buffers.sql": "water_buf_dissolved",
+    "04_create_terrain_grid.sql": "terrain_grid",
+    "05_create_terrain_edges.sql": "terrain_edges",
+    "06_create_water_edges.sql": "water_edges",
+}
+
+# The osm2pgsql tables the pipeline reads its source data from
+SOURCE_TABLES = [
+    "planet_osm_line",
+    "planet_osm_point",
+    "planet_osm_polygon",
+    "planet_osm_roads",
+]
+
 
 def get_db_connection(conn_string: Optional[str] = None) -> psycopg2.extensions.connection:
     """
@@ -55,17 +85,270 @@ def get_db_connection(conn_string: Optional[str] = None) -> psycopg2.extensions.
     
     try:
         conn = psycopg2.connect(conn_string)
-        logger.info(f"Connected to database: {conn_string.split('@')[-1]}")
+        logger.info("Connected to database: %s", conn_string.split('@')[-1])
         return conn
     except Exception as e:
-        logger.error(f"Error connecting to database: {e}")
+        logger.error("Error connecting to database: %s", e)
         raise
 
 
+def format_sql_params(params: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Convert parameter values to the SQL text that replaces them.
+    
+    Args:
+        params: Dictionary of parameters
+    
+    Returns:
+        Dictionary mapping each parameter name to its SQL text
+    """
+    sql_params = {}
+    for key, value in params.items():
+        if isinstance(value, list):
+            # Convert lists to PostgreSQL arrays
+            sql_params[key] = "'{" + ",".join([str(item) for item in value]) + "}'"
+        elif isinstance(value, bool):
+            # Convert booleans to PostgreSQL booleans
+            sql_params[key] = str(value).lower()
+        else:
+            sql_params[key] = str(value)
+    
+    return sql_params
+
+
+@functools.lru_cache(maxsize=32)
+def _read_sql_text(sql_file: str, mtime_ns: int) -> str:
+    """Read a SQL file; the modification time only keys the cache."""
+    with open(sql_file, 'r') as f:
+        return f.read()
+
+
+def read_sql_file(sql_file: str) -> str:
+    """
+    Read a SQL file, reusing its contents while the file is unchanged.
+    
+    Args:
+        sql_file: Path to SQL file
+    
+    Returns:
+        The contents of the file
+    """
+    return _read_sql_text(os.path.abspath(sql_file), os.stat(sql_file).st_mtime_ns)
+
+
+def render_sql_file(sql_file: str, params: Dict[str, Any]) -> str:
+    """
+    Read a SQL file and replace its parameters.
+    
+    Args:
+        sql_file: Path to SQL file
+        params: Dictionary of parameters to replace in the SQL; values that
+            are already strings (e.g. from format_sql_params) are used as is
+    
+    Returns:
+        The SQL with parameters replaced
+    """
+    sql = read_sql_file(sql_file)
+    sql_params = format_sql_params(params)
+    
+    # Replace every parameter in one pass over the SQL; names that aren't
+    # parameters are left alone, as are casts such as ::geography
+    return SQL_PARAM_PATTERN.sub(
+        lambda match: sql_params.get(match.group(1), match.group(0)),
+        sql
+    )
+
+
+def get_source_fingerprint(conn: psycopg2.extensions.connection) -> str:
+    """
+    Identify the imported OSM data the pipeline reads from.
+    
+    osm2pgsql --create recreates its tables, giving them new file nodes, so
+    the fingerprint changes with every import.
+    
+    Args:
+        conn: Database connection
+    
+    Returns:
+        The storage file node and estimated row count of each source table
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT string_agg(
+                name || ':' || COALESCE(c.relfilenode::text, '-') || ':' ||
+                    COALESCE(c.reltuples::bigint::text, '-'),
+                ',' ORDER BY name
+            )
+            FROM unnest(%s::text[]) AS name
+            LEFT JOIN pg_class c ON c.oid = to_regclass(name)
+        """, (SOURCE_TABLES,))
+        return cur.fetchone()[0]
+
+
+def chain_stage_hashes(source_fingerprint: str, stages: List[Tuple[str, str]]) -> List[str]:
+    """
+    Compute the input hash of each pipeline step.
+    
+    Each hash covers the source data fingerprint and the name and rendered
+    SQL of the step and of every step before it, so a change to any earlier
+    input changes the hash of every later step.
+    
+    Args:
+        source_fingerprint: Result of get_source_fingerprint()
+        stages: (SQL file name, rendered SQL) of each step, in order
+    
+    Returns:
+        Hex digest for each step, in the same order
+    """
+    input_hash = hashlib.sha256(source_fingerprint.encode())
+    stage_hashes = []
+    for sql_file, sql in stages:
+        input_hash.update(sql_file.encode())
+        input_hash.update(sql.encode())
+        stage_hashes.append(input_hash.hexdigest())
+    
+    return stage_hashes
+
+
+def get_stage_runs(conn: psycopg2.extensions.connection) -> Dict[str, Tuple[str, Optional[int]]]:
+    """
+    Get the recorded run of each pipeline step that has completed.
+    
+    Args:
+        conn: Database connection
+    
+    Returns:
+        Dictionary mapping SQL file names to (input hash, OID of the output
+        table the step built)
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass('pipeline_stage_runs') IS NOT NULL")
+        if not cur.fetchone()[0]:
+            return {}
+        
+        cur.execute("SELECT stage, input_hash, output_oid FROM pipeline_stage_runs")
+        return {stage: (input_hash, output_oid) for stage, input_hash, output_oid in cur.fetchall()}
+
+
+def get_output_tables(
+    conn: psycopg2.extensions.connection,
+    tables: List[str]
+) -> Dict[str, Tuple[int, bool]]:
+    """
+    Check which output tables exist and whether they have rows.
+    
+    Args:
+        conn: Database connection
+        tables: Names of the tables to check
+    
+    Returns:
+        Dictionary mapping the name of each existing table to (OID, has rows)
+    """
+    output_tables = {}
+    with conn.cursor() as cur:
+        for table in tables:
+            cur.execute("SELECT to_regclass(%s)::oid", (table,))
+            oid = cur.fetchone()[0]
+            if oid is None:
+                continue
+            
+            cur.execute(pgsql.SQL("SELECT EXISTS (SELECT 1 FROM {})").format(pgsql.Identifier(table)))
+            output_tables[table] = (oid, cur.fetchone()[0])
+    
+    return output_tables
+
+
+def is_stage_reusable(
+    sql_file: str,
+    stage_hash: str,
+    stage_runs: Dict[str, Tuple[str, Optional[int]]],
+    output_tables: Dict[str, Tuple[int, bool]]
+) -> bool:
+    """
+    Decide whether a pipeline step can be skipped.
+    
+    A step is skipped only if its recorded input hash matches, and the table
+    it built is the same table (by OID) and still has rows. A table that was
+    dropped, emptied or rebuilt by another pipeline under the same name
+    makes the step run again.
+    
+    Args:
+        sql_file: SQL file name of the step
+        stage_hash: The step's current input hash
+        stage_runs: Result of get_stage_runs()
+        output_tables: Result of get_output_tables()
+    
+    Returns:
+        True if the step's output can be reused
+    """
+    if any(sql_file.startswith(step) for step in UNCACHED_STEPS):
+        return False
+    
+    table = STAGE_OUTPUT_TABLES.get(sql_file)
+    recorded = stage_runs.get(sql_file)
+    if table is None or recorded is None:
+        return False
+    
+    recorded_hash, recorded_oid = recorded
+    return (
+        recorded_hash == stage_hash
+        and recorded_oid is not None
+        and output_tables.get(table) == (recorded_oid, True)
+    )
+
+
+def create_stage_runs_table(conn: psycopg2.extensions.connection) -> None:
+    """
+    Create the table recording completed pipeline steps, if it doesn't exist.
+    
+    Args:
+        conn: Database connection
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS pipeline_stage_runs (
+                stage TEXT PRIMARY KEY,
+                input_hash TEXT NOT NULL,
+                output_oid OID,
+                finished_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+
+def record_stage_run(
+    conn: psycopg2.extensions.connection,
+    stage: str,
+    input_hash: str
+) -> None:
+    """
+    Record the input hash and output table of a completed pipeline step.
+    
+    The record is written in the caller's transaction, so it is only kept if
+    the step's own changes are committed. The table must already exist; see
+    create_stage_runs_table().
+    
+    Args:
+        conn: Database connection
+        stage: SQL file name of the step
+        input_hash: Result of chain_stage_hashes() for the step
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO pipeline_stage_runs (stage, input_hash, output_oid)
+            VALUES (%(stage)s, %(input_hash)s, to_regclass(%(table)s)::oid)
+            ON CONFLICT (stage) DO UPDATE
+            SET input_hash = EXCLUDED.input_hash,
+                output_oid = EXCLUDED.output_oid,
+                finished_at = CURRENT_TIMESTAMP;
+        """, {'stage': stage, 'input_hash': input_hash, 'table': STAGE_OUTPUT_TABLES.get(stage)})
+
+
 def execute_sql_file(
     conn: psycopg2.extensions.connection,
     sql_file: str,
-    params: Dict[str, Any]
+    params: Dict[str, Any],
+    commit: bool = True,
+    sql: Optional[str] = None
 ) -> None:
     """
     Execute a SQL file with parameters.
@@ -74,41 +357,35 @@ def execute_sql_file(
         conn: Database connection
         sql_file: Path to SQL file
         params: Dictionary of parameters to replace in the SQL
+        commit: Whether to commit after the file; if False, the caller owns
+            the transaction and must commit or roll back
+        sql: The file's SQL with parameters already replaced, if the caller
+            has rendered it; otherwise it is rendered here
     
     Raises:
         Exception: If SQL execution fails
     """
-    logger.info(f"Executing SQL file: {os.path.basename(sql_file)}")
+    logger.info("Executing SQL file: %s", os.path.basename(sql_file))
     
     start_time = time.time()
     
     try:
-        with open(sql_file, 'r') as f:
-            sql = f.read()
-        
-        # Replace parameters in SQL
-        for key, value in params.items():
-            if isinstance(value, list):
-                # Convert lists to PostgreSQL arrays
-                pg_array = "'{" + ",".join([str(item) for item in value]) + "}'"
-                sql = sql.replace(f":{key}", pg_array)
-            elif isinstance(value, bool):
-                # Convert booleans to PostgreSQL booleans
-                sql = sql.replace(f":{key}", str(value).lower())
-            else:
-                sql = sql.replace(f":{key}", str(value))
+        if sql is None:
+            sql = render_sql_file(sql_file, params)
         
         with conn.cursor() as cur:
             cur.execute(sql)
         
-        conn.commit()
+        if commit:
+            conn.commit()
         
         elapsed_time = time.time() - start_time
-        logger.info(f"Completed {os.path.basename(sql_file)} in {elapsed_time:.2f} seconds")
+        logger.info("Completed %s in %.2f seconds", os.path.basename(sql_file), elapsed_time)
     
     except Exception as e:
-        conn.rollback()
-        logger.error(f"Error executing {os.path.basename(sql_file)}: {e}")
+        if commit:
+            conn.rollback()
+        logger.error("Error executing %s: %s", os.path.basename(sql_file), e)
         raise
 
 
@@ -116,16 +393,23 @@ def run_pipeline(
     config_path: str,
     sql_dir: str,
     conn_string: Optional[str] = None,
-    skip_steps: Optional[List[str]] = None
+    skip_steps: Optional[List[str]] = None,
+    use_cache: bool = False
 ) -> None:
     """
     Run the water obstacle modeling pipeline.
     
+    With use_cache, leading steps are skipped while is_stage_reusable()
+    holds for them: their input hash from chain_stage_hashes(), which also
+    covers the imported OSM data, matches the last run, and the table they
+    built is still in place.
+    
     Args:
         config_path: Path to configuration JSON file
         sql_dir: Directory containing SQL scripts
         conn_string: PostgreSQL connection string
         skip_steps: List of steps to skip (e.g., ['01', '02'])
+        use_cache: Whether to skip steps whose inputs and outputs are unchanged
     
     Raises:
         Exception: If pipeline execution fails
@@ -133,10 +417,11 @@ def run_pipeline(
     # Load configuration
     try:
         config = ConfigLoader(config_path)
-        params = config.get_sql_params()
-        logger.info(f"Loaded configuration from {config_path}")
+        # Format the parameters once, rather than again for every SQL file
+        params = format_sql_params(config.get_sql_params())
+        logger.info("Loaded configuration from %s", config_path)
     except Exception as e:
-        logger.error(f"Error loading configuration: {e}")
+        logger.error("Error loading configuration: %s", e)
         raise
     
     # Connect to database
@@ -158,19 +443,49 @@ def run_pipeline(
         if skip_steps:
             sql_files = [f for f in sql_files if not any(f.startswith(step) for step in skip_steps)]
         
-        # Execute SQL scripts in order
+        # Derived tables can be rebuilt from the OSM data, so skip the WAL flush at commit
+        with conn.cursor() as cur:
+            cur.execute("SET LOCAL synchronous_commit TO OFF")
+        
+        stages = []
         for sql_file in sql_files:
             sql_path = os.path.join(sql_dir, sql_file)
             if not os.path.exists(sql_path):
-                logger.error(f"SQL file not found: {sql_path}")
+                logger.error("SQL file not found: %s", sql_path)
                 raise FileNotFoundError(f"SQL file not found: {sql_path}")
             
-            execute_sql_file(conn, sql_path, params)
+            stages.append((sql_file, render_sql_file(sql_path, params)))
+        
+        stage_hashes = chain_stage_hashes(get_source_fingerprint(conn), stages)
+        
+        stage_runs, output_tables = {}, {}
+        if use_cache:
+            stage_runs = get_stage_runs(conn)
+            output_tables = get_output_tables(conn, list(STAGE_OUTPUT_TABLES.values()))
+        reuse = use_cache
+        
+        create_stage_runs_table(conn)
         
+        # Execute SQL scripts in order, all in one transaction so the
+        # pipeline commits (and flushes the WAL) once
+        for (sql_file, sql), stage_hash in zip(stages, stage_hashes):
+            sql_path = os.path.join(sql_dir, sql_file)
+            
+            # Once one step runs, every later step has to run after it
+            reuse = reuse and is_stage_reusable(sql_file, stage_hash, stage_runs, output_tables)
+            if reuse:
+                logger.info("Skipping %s; its inputs are unchanged since the last run", sql_file)
+                continue
+            
+            execute_sql_file(conn, sql_path, params, commit=False, sql=sql)
+            record_stage_run(conn, sql_file, stage_hash)
+        
+        conn.commit()
         logger.info("Water obstacle modeling pipeline completed successfully")
     
     except Exception as e:
-        logger.error(f"Pipeline execution failed: {e}")
+        conn.rollback()
+        logger.error("Pipeline execution failed: %s", e)
         raise
     
     finally:
@@ -178,9 +493,20 @@ def run_pipeline(
         logger.info("Database connection closed")
 
 
-def main():
-    """Main entry point."""
-    parser = argparse.ArgumentParser(description="Run the water obstacle modeling pipeline")
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Main entry point.
+    
+    Args:
+        argv: Command-line arguments; defaults to sys.argv[1:]
+    
+    Returns:
+        Exit code (0 for success, non-zero for failure)
+    """
+    parser = argparse.ArgumentParser(
+        description="Run the water obstacle modeling pipeline",
+        fromfile_prefix_chars="@"
+    )
     parser.add_argument(
         "--config",
         default="config/default_config.json",
@@ -200,13 +526,19 @@ def main():
         nargs="+",
         help="Steps to skip (e.g., 01 02)"
     )
+    parser.add_argument(
+        "--use-cache",
+        action="store_true",
+        help="Skip leading steps whose inputs, source data and output tables "
+             "are unchanged since the last run"
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
         help="Enable verbose logging"
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Set log level
     if args.verbose:
@@ -222,11 +554,12 @@ def main():
             config_path=str(config_path),
             sql_dir=str(sql_dir),
             conn_string=args.conn_string,
-            skip_steps=args.skip
+            skip_steps=args.skip,
+            use_cache=args.use_cache
         )
         return 0
     except Exception as e:
-        logger.error(f"Pipeline failed: {e}")
+        logger.error("Pipeline failed: %s", e)
         return 1
 
 
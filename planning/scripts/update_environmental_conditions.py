@@ -18,6 +18,8 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 
 import psycopg2
+import psycopg2.errors
+import psycopg2.extras
 
 # Add the parent directory to the path so we can import config_loader
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -54,17 +56,18 @@ def get_db_connection(conn_string: Optional[str] = None) -> psycopg2.extensions.
     
     try:
         conn = psycopg2.connect(conn_string)
-        logger.info(f"Connected to database: {conn_string.split('@')[-1]}")
+        logger.info("Connected to database: %s", conn_string.split('@')[-1])
         return conn
     except Exception as e:
-        logger.error(f"Error connecting to database: {e}")
+        logger.error("Error connecting to database: %s", e)
         raise
 
 
 def update_conditions(
     config_path: str,
     conditions_override: Optional[Dict[str, float]] = None,
-    conn_string: Optional[str] = None
+    conn_string: Optional[str] = None,
+    conn: Optional[psycopg2.extensions.connection] = None
 ) -> None:
     """
     Update environmental conditions in the database.
@@ -73,6 +76,9 @@ def update_conditions(
         config_path: Path to configuration JSON file
         conditions_override: Dictionary of conditions to override from the config
         conn_string: PostgreSQL connection string
+        conn: Existing database connection to use; the caller keeps ownership
+            and it is left open. If None, a connection is opened from
+            conn_string and closed afterwards
     
     Raises:
         Exception: If update fails
@@ -81,88 +87,98 @@ def update_conditions(
     try:
         config = ConfigLoader(config_path)
         env_conditions = config.get_section('environmental_conditions')
-        logger.info(f"Loaded configuration from {config_path}")
+        logger.info("Loaded configuration from %s", config_path)
         
         # Override conditions if specified
         if conditions_override:
             env_conditions.update(conditions_override)
-            logger.info(f"Overriding conditions: {conditions_override}")
+            logger.info("Overriding conditions: %s", conditions_override)
         
         # Log the conditions that will be applied
-        logger.info(f"Applying environmental conditions: {env_conditions}")
+        logger.info("Applying environmental conditions: %s", env_conditions)
     except Exception as e:
-        logger.error(f"Error loading configuration: {e}")
+        logger.error("Error loading configuration: %s", e)
         raise
     
-    # Connect to database
-    conn = get_db_connection(conn_string)
+    # Connect to database, unless the caller shares its connection
+    owns_connection = conn is None
+    if owns_connection:
+        conn = get_db_connection(conn_string)
     
     try:
         with conn.cursor() as cur:
-            # Check if the environmental_conditions table exists
-            cur.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'environmental_conditions'
-                )
-            """)
-            table_exists = cur.fetchone()[0]
+            # The read-back of the results is only used for the log below
+            report = logger.isEnabledFor(logging.INFO)
             
-            if not table_exists:
-                logger.error("Environmental conditions table does not exist. Run the pipeline first.")
-                raise Exception("Environmental conditions table does not exist")
+            sql = """
+                INSERT INTO environmental_conditions (condition_name, value)
+                VALUES %s
+                ON CONFLICT (condition_name) DO UPDATE
+                SET value = EXCLUDED.value,
+                    last_updated = CURRENT_TIMESTAMP;
+                
+                SELECT update_water_crossability();
+            """
+            if report:
+                sql += """
+                    -- Get the updated conditions with the effect on water edges
+                    SELECT 
+                        ce.condition_name,
+                        ce.value,
+                        ce.description,
+                        cost_stats.min_cost,
+                        cost_stats.max_cost,
+                        cost_stats.avg_cost
+                    FROM current_environment ce
+                    CROSS JOIN (
+                        SELECT 
+                            MIN(cost) as min_cost,
+                            MAX(cost) as max_cost,
+                            AVG(cost) as avg_cost
+                        FROM water_edges
+                    ) cost_stats;
+                """
             
-            # Update each environmental condition
-            for condition, value in env_conditions.items():
-                cur.execute(
-                    """
-                    INSERT INTO environmental_conditions (condition_name, value)
-                    VALUES (%s, %s)
-                    ON CONFLICT (condition_name) DO UPDATE
-                    SET value = EXCLUDED.value,
-                        last_updated = CURRENT_TIMESTAMP
-                    """,
-                    (condition, value)
+            # Send the upsert, the crossability update and the read-back of
+            # the results as one batch so they cost a single round trip;
+            # execute_values expands every condition into the one VALUES list
+            try:
+                updated_conditions = psycopg2.extras.execute_values(
+                    cur, sql, list(env_conditions.items()),
+                    page_size=max(len(env_conditions), 1), fetch=report
                 )
-            
-            # Run the update function to recalculate crossability
-            cur.execute("SELECT update_water_crossability()")
-            
-            # Get the updated conditions
-            cur.execute("SELECT * FROM current_environment")
-            updated_conditions = cur.fetchall()
-            
-            # Get the effect on water edges
-            cur.execute("""
-                SELECT 
-                    MIN(cost) as min_cost,
-                    MAX(cost) as max_cost,
-                    AVG(cost) as avg_cost
-                FROM water_edges
-            """)
-            cost_stats = cur.fetchone()
+            except psycopg2.errors.UndefinedTable:
+                logger.error("Environmental conditions table does not exist. Run the pipeline first.")
+                raise Exception("Environmental conditions table does not exist")
             
             conn.commit()
             
             # Log the results
-            logger.info("Environmental conditions updated successfully")
-            logger.info("Current environmental conditions:")
-            for row in updated_conditions:
-                logger.info(f"  {row[0]}: {row[1]} ({row[3]})")
-            
-            logger.info("Effect on water edge costs:")
-            logger.info(f"  Min cost: {cost_stats[0]:.2f}")
-            logger.info(f"  Max cost: {cost_stats[1]:.2f}")
-            logger.info(f"  Avg cost: {cost_stats[2]:.2f}")
+            if report:
+                # The fetched rows come from the last statement in the batch
+                cost_stats = updated_conditions[0][3:] if updated_conditions else (0, 0, 0)
+                
+                # Emit the whole summary as a single log record
+                logger.info(
+                    "Environmental conditions updated successfully\n"
+                    "Current environmental conditions:\n%s\n"
+                    "Effect on water edge costs:\n"
+                    "  Min cost: %.2f\n"
+                    "  Max cost: %.2f\n"
+                    "  Avg cost: %.2f",
+                    "\n".join(f"  {row[0]}: {row[1]} ({row[2]})" for row in updated_conditions),
+                    *cost_stats
+                )
     
     except Exception as e:
         conn.rollback()
-        logger.error(f"Error updating environmental conditions: {e}")
+        logger.error("Error updating environmental conditions: %s", e)
         raise
     
     finally:
-        conn.close()
-        logger.info("Database connection closed")
+        if owns_connection:
+            conn.close()
+            logger.info("Database connection closed")
 
 
 def main():
@@ -220,7 +236,7 @@ def main():
         try:
             conditions_override.update(json.loads(args.conditions))
         except json.JSONDecodeError as e:
-            logger.error(f"Error parsing conditions JSON: {e}")
+            logger.error("Error parsing conditions JSON: %s", e)
             return 1
     
     # From individual arguments
@@ -241,7 +257,7 @@ def main():
         )
         return 0
     except Exception as e:
-        logger.error(f"Update failed: {e}")
+        logger.error("Update failed: %s", e)
         return 1
 
 
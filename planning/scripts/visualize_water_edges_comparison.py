@@ -14,10 +14,13 @@ import sys
 import argparse
 import logging
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List
 
 import psycopg2
 import geopandas as gpd
+import matplotlib
+# Figures are only ever saved to files, so skip loading an interactive backend
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
 import numpy as np
@@ -27,19 +30,11 @@ from shapely.geometry import box
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
 # Import file management utilities
-from utils.file_management import get_visualization_path, get_log_path
+from utils.file_management import get_visualization_path
+from utils.logging_utils import get_logger
 
 # Configure logging
-log_path = get_log_path("water_edges_comparison")
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(log_path)
-    ]
-)
-logger = logging.getLogger('visualization')
+logger = get_logger('visualization', "water_edges_comparison")
 
 
 def get_db_connection(conn_string: Optional[str] = None) -> psycopg2.extensions.connection:
@@ -128,16 +123,20 @@ def get_data_for_visualization(
     data = {}
     
     try:
-        # Create a spatial filter if extent is provided
+        # Create a spatial filter if extent is provided. The bounds are
+        # passed as query parameters, so the query text is the same for
+        # every extent and the values are never formatted into the SQL
         spatial_filter = ""
+        extent_params = None
         if extent:
             min_x, min_y, max_x, max_y = extent
-            spatial_filter = f"""
+            spatial_filter = """
                 WHERE ST_Intersects(
                     geom,
-                    ST_MakeEnvelope({min_x}, {min_y}, {max_x}, {max_y}, 4326)
+                    ST_MakeEnvelope(%(min_x)s, %(min_y)s, %(max_x)s, %(max_y)s, 4326)
                 )
             """
+            extent_params = {'min_x': min_x, 'min_y': min_y, 'max_x': max_x, 'max_y': max_y}
         
         # Get water buffers (original)
         water_buf_query = f"""
@@ -155,7 +154,8 @@ def get_data_for_visualization(
         data['water_buf'] = gpd.read_postgis(
             water_buf_query,
             conn,
-            geom_col='geom'
+            geom_col='geom',
+            params=extent_params
         )
         logger.info(f"Retrieved {len(data['water_buf'])} water buffers (original)")
         
@@ -176,7 +176,8 @@ def get_data_for_visualization(
         data['water_buf_dissolved'] = gpd.read_postgis(
             water_buf_dissolved_query,
             conn,
-            geom_col='geom'
+            geom_col='geom',
+            params=extent_params
         )
         logger.info(f"Retrieved {len(data['water_buf_dissolved'])} water buffers (dissolved)")
         
@@ -202,7 +203,8 @@ def get_data_for_visualization(
             data['water_edges_original'] = gpd.read_postgis(
                 water_edges_original_query,
                 conn,
-                geom_col='geom'
+                geom_col='geom',
+                params=extent_params
             )
             logger.info(f"Retrieved {len(data['water_edges_original'])} water edges (original)")
         except Exception as e:
@@ -231,7 +233,8 @@ def get_data_for_visualization(
             data['water_edges_dissolved'] = gpd.read_postgis(
                 water_edges_dissolved_query,
                 conn,
-                geom_col='geom'
+                geom_col='geom',
+                params=extent_params
             )
             logger.info(f"Retrieved {len(data['water_edges_dissolved'])} water edges (dissolved)")
         except Exception as e:
@@ -470,8 +473,16 @@ def create_visualization(
         raise
 
 
-def main():
-    """Main entry point."""
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Main entry point.
+    
+    Args:
+        argv: Command-line arguments; defaults to sys.argv[1:]
+    
+    Returns:
+        Exit code (0 for success, non-zero for failure)
+    """
     parser = argparse.ArgumentParser(description="Visualize and compare water edge generation methods")
     parser.add_argument(
         "--output",
@@ -526,7 +537,7 @@ def main():
         help="Enable verbose logging"
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Set log level
     if args.verbose:
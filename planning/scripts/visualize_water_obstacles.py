@@ -17,10 +17,14 @@ import sys
 import argparse
 import logging
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List
 
 import psycopg2
 import geopandas as gpd
+import matplotlib
+# Figures are only ever saved to files; this also makes rendering safe from
+# worker threads when the module is used in-process
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
 import numpy as np
@@ -30,19 +34,14 @@ from shapely.geometry import box
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
 # Import file management utilities
-from utils.file_management import get_visualization_path, get_log_path
+from utils.file_management import get_visualization_path
+from utils.logging_utils import get_logger
 
 # Configure logging
-log_path = get_log_path("water_visualization")
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(log_path)
-    ]
-)
-logger = logging.getLogger('visualization')
+logger = get_logger('visualization', "water_visualization")
+
+# Layers that are not affected by environmental condition updates
+STATIC_LAYERS = ('water_buffers', 'terrain_grid', 'terrain_edges')
 
 
 def get_db_connection(conn_string: Optional[str] = None) -> psycopg2.extensions.connection:
@@ -108,7 +107,8 @@ def get_data_extent(conn: psycopg2.extensions.connection) -> Tuple[float, float,
 def get_data_for_visualization(
     conn: psycopg2.extensions.connection,
     extent: Optional[Tuple[float, float, float, float]] = None,
-    limit_rows: bool = True
+    limit_rows: bool = True,
+    static_layers: Optional[Dict[str, gpd.GeoDataFrame]] = None
 ) -> Dict[str, gpd.GeoDataFrame]:
     """
     Get data for visualization.
@@ -117,6 +117,8 @@ def get_data_for_visualization(
         conn: Database connection
         extent: Optional bounding box to limit the data
         limit_rows: Whether to limit the number of rows returned
+        static_layers: Optional previously fetched STATIC_LAYERS to reuse
+            instead of querying them again
     
     Returns:
         Dictionary of GeoDataFrames
@@ -124,79 +126,87 @@ def get_data_for_visualization(
     Raises:
         Exception: If query fails
     """
-    data = {}
+    data = dict(static_layers) if static_layers else {}
     
     try:
-        # Create a spatial filter if extent is provided
+        # Create a spatial filter if extent is provided. The bounds are
+        # passed as query parameters, so the query text is the same for
+        # every extent and the values are never formatted into the SQL
         spatial_filter = ""
+        extent_params = None
         if extent:
             min_x, min_y, max_x, max_y = extent
-            spatial_filter = f"""
+            spatial_filter = """
                 WHERE ST_Intersects(
                     geom,
-                    ST_MakeEnvelope({min_x}, {min_y}, {max_x}, {max_y}, 4326)
+                    ST_MakeEnvelope(%(min_x)s, %(min_y)s, %(max_x)s, %(max_y)s, 4326)
                 )
             """
+            extent_params = {'min_x': min_x, 'min_y': min_y, 'max_x': max_x, 'max_y': max_y}
         
-        # Get water buffers
-        water_query = f"""
-            SELECT 
-                id,
-                crossability_group,
-                crossability,
-                buffer_rules_applied,
-                crossability_rules_applied,
-                avg_buffer_size_m,
-                geom
-            FROM water_buf_dissolved
-            {spatial_filter}
-        """
+        if not static_layers:
+            # Get water buffers
+            water_query = f"""
+                SELECT 
+                    id,
+                    crossability_group,
+                    crossability,
+                    buffer_rules_applied,
+                    crossability_rules_applied,
+                    avg_buffer_size_m,
+                    geom
+                FROM water_buf_dissolved
+                {spatial_filter}
+            """
         
-        data['water_buffers'] = gpd.read_postgis(
-            water_query,
-            conn,
-            geom_col='geom'
-        )
-        logger.info(f"Retrieved {len(data['water_buffers'])} water buffers")
+            data['water_buffers'] = gpd.read_postgis(
+                water_query,
+                conn,
+                geom_col='geom',
+                params=extent_params
+            )
+            logger.info(f"Retrieved {len(data['water_buffers'])} water buffers")
         
-        # Get terrain grid
-        limit_clause = "LIMIT 10000" if limit_rows else ""
-        terrain_query = f"""
-            SELECT 
-                id,
-                cost,
-                geom
-            FROM terrain_grid
-            {spatial_filter}
-            {limit_clause}
-        """
+            # Get terrain grid
+            limit_clause = "LIMIT 10000" if limit_rows else ""
+            terrain_query = f"""
+                SELECT 
+                    id,
+                    cost,
+                    geom
+                FROM terrain_grid
+                {spatial_filter}
+                {limit_clause}
+            """
         
-        data['terrain_grid'] = gpd.read_postgis(
-            terrain_query,
-            conn,
-            geom_col='geom'
-        )
-        logger.info(f"Retrieved {len(data['terrain_grid'])} terrain grid cells")
+            data['terrain_grid'] = gpd.read_postgis(
+                terrain_query,
+                conn,
+                geom_col='geom',
+                params=extent_params
+            )
+            logger.info(f"Retrieved {len(data['terrain_grid'])} terrain grid cells")
         
-        # Get terrain edges
-        limit_clause = "LIMIT 20000" if limit_rows else ""
-        terrain_edges_query = f"""
-            SELECT 
-                id,
-                cost,
-                length_m,
-                geom
-            FROM terrain_edges
-            {spatial_filter}
-            {limit_clause}
-        """
+            # Get terrain edges
+            limit_clause = "LIMIT 20000" if limit_rows else ""
+            terrain_edges_query = f"""
+                SELECT 
+                    id,
+                    cost,
+                    length_m,
+                    geom
+                FROM terrain_edges
+                {spatial_filter}
+                {limit_clause}
+            """
         
-        data['terrain_edges'] = gpd.read_postgis(
-            terrain_edges_query,
-            conn,
-            geom_col='geom'
-        )
-        logger.info(f"Retrieved {len(data['terrain_edges'])} terrain edges")
+            data['terrain_edges'] = gpd.read_postgis(
+                terrain_edges_query,
+                conn,
+                geom_col='geom',
+                params=extent_params
+            )
+            logger.info(f"Retrieved {len(data['terrain_edges'])} terrain edges")
         
         # Get water edges
         limit_clause = "LIMIT 20000" if limit_rows else ""
@@ -220,7 +230,8 @@ def get_data_for_visualization(
         data['water_edges'] = gpd.read_postgis(
             water_edges_query,
             conn,
-            geom_col='geom'
+            geom_col='geom',
+            params=extent_params
         )
         logger.info(f"Retrieved {len(data['water_edges'])} water edges")
         
@@ -238,6 +249,20 @@ def get_data_for_visualization(
         raise
 
 
+def get_applied_rules(rules_column) -> list:
+    """
+    Get the sorted unique rules from a column of comma-separated rule lists.
+    
+    Args:
+        rules_column: Series of comma-separated rule strings
+    
+    Returns:
+        Sorted list of unique rule names
+    """
+    rules = rules_column.dropna().str.split(',').explode().str.strip()
+    return sorted(rules[rules != ''].unique())
+
+
 def create_visualization(
     data: Dict[str, Any],
     output_file: Optional[str] = None,
@@ -333,9 +358,10 @@ def create_visualization(
         
         # Add environmental conditions as text
         if 'env_conditions' in data:
-            env_text = "Environmental Conditions:\n"
-            for condition, (value, description) in data['env_conditions'].items():
-                env_text += f"{condition}: {value:.2f} ({description})\n"
+            env_text = "Environmental Conditions:\n" + "".join(
+                f"{condition}: {value:.2f} ({description})\n"
+                for condition, (value, description) in data['env_conditions'].items()
+            )
             
             plt.figtext(
                 0.02, 0.02,
@@ -347,32 +373,20 @@ def create_visualization(
         # Add decision tracking information if requested
         if show_decision_info and 'water_buffers' in data:
             # Get unique buffer rules and crossability rules
-            buffer_rules = set()
-            crossability_rules = set()
-            
-            for rules in data['water_buffers']['buffer_rules_applied']:
-                if rules:
-                    buffer_rules.update(rule.strip() for rule in rules.split(','))
-            
-            for rules in data['water_buffers']['crossability_rules_applied']:
-                if rules:
-                    crossability_rules.update(rule.strip() for rule in rules.split(','))
-            
-            # Create decision tracking text
-            decision_text = "Water Modeling Decisions:\n\n"
+            buffer_rules = get_applied_rules(data['water_buffers']['buffer_rules_applied'])
+            crossability_rules = get_applied_rules(data['water_buffers']['crossability_rules_applied'])
+            group_counts = data['water_buffers']['crossability_group'].value_counts()
             
-            decision_text += "Buffer Rules Applied:\n"
-            for rule in sorted(buffer_rules):
-                decision_text += f"• {rule}\n"
-            
-            decision_text += "\nCrossability Rules Applied:\n"
-            for rule in sorted(crossability_rules):
-                decision_text += f"• {rule}\n"
+            # Create decision tracking text in one pass
+            decision_lines = ["Water Modeling Decisions:", "", "Buffer Rules Applied:"]
+            decision_lines.extend(f"• {rule}" for rule in buffer_rules)
+            decision_lines.extend(["", "Crossability Rules Applied:"])
+            decision_lines.extend(f"• {rule}" for rule in crossability_rules)
             
             # Add statistics
-            decision_text += "\nCrossability Groups:\n"
-            for group, count in data['water_buffers']['crossability_group'].value_counts().items():
-                decision_text += f"• {group}: {count} features\n"
+            decision_lines.extend(["", "Crossability Groups:"])
+            decision_lines.extend(f"• {group}: {count} features" for group, count in group_counts.items())
+            decision_text = "\n".join(decision_lines) + "\n"
             
             plt.figtext(
                 0.75, 0.02,
@@ -415,8 +429,16 @@ def create_visualization(
         raise
 
 
-def main():
-    """Main entry point."""
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Main entry point.
+    
+    Args:
+        argv: Command-line arguments; defaults to sys.argv[1:]
+    
+    Returns:
+        Exit code (0 for success, non-zero for failure)
+    """
     parser = argparse.ArgumentParser(description="Visualize water obstacles and terrain grid")
     parser.add_argument(
         "--output",
@@ -471,7 +493,7 @@ def main():
         help="Enable verbose logging"
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Set log level
     if args.verbose:
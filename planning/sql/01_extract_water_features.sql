@@ -6,7 +6,9 @@
 -- :min_area_sqm - Minimum area for polygon water features
 -- :include_intermittent - Whether to include intermittent water features
 
--- Create water_features table
+-- Create water_features table. The size and intermittency filters are
+-- applied while the table is built, so rows that would be filtered out are
+-- never written (and then deleted again)
 DROP TABLE IF EXISTS water_features;
 CREATE TABLE water_features AS
 -- Water polygons
@@ -28,9 +30,13 @@ SELECT
         ELSE NULL
     END AS water_type
 FROM planet_osm_polygon
-WHERE (water IS NOT NULL)
+WHERE ((water IS NOT NULL)
    OR ("natural" = 'water')
-   OR (landuse = 'reservoir')
+   OR (landuse = 'reservoir'))
+  -- Filter out small water bodies if specified
+  AND (ST_Area(ST_Transform(way, 4326)::geography) < :min_area_sqm) IS NOT TRUE
+  -- Filter out intermittent water features if not included
+  AND (intermittent = 'yes' AND :include_intermittent = false) IS NOT TRUE
 
 UNION ALL
 
@@ -48,15 +54,9 @@ SELECT
     intermittent,
     waterway AS water_type
 FROM planet_osm_line
-WHERE waterway = ANY(ARRAY[:line_types]);
-
--- Filter out small water bodies if specified
-DELETE FROM water_features 
-WHERE feature_type = 'polygon' AND ST_Area(ST_Transform(geom, 4326)::geography) < :min_area_sqm;
-
--- Filter out intermittent water features if not included
-DELETE FROM water_features 
-WHERE intermittent = 'yes' AND :include_intermittent = false;
+WHERE waterway = ANY(ARRAY[:line_types])
+  -- Filter out intermittent water features if not included
+  AND (intermittent = 'yes' AND :include_intermittent = false) IS NOT TRUE;
 
 -- Create spatial index
 CREATE INDEX ON water_features USING GIST(geom);
@@ -6,34 +6,39 @@
 DROP TABLE IF EXISTS water_buf_dissolved;
 CREATE TABLE water_buf_dissolved AS
 WITH 
--- First, identify clusters of spatially connected water buffers
-connected_clusters AS (
+-- Classify each buffer into its crossability range once
+grouped_buffers AS (
     SELECT
         CASE
             WHEN crossability < 20 THEN 'low'
             WHEN crossability < 50 THEN 'medium'
             ELSE 'high'
         END AS crossability_group,
+        id,
+        crossability,
+        buffer_rule_applied,
+        crossability_rule_applied,
+        buffer_size_m,
+        geom
+    FROM water_buf
+),
+-- First, identify clusters of spatially connected water buffers
+connected_clusters AS (
+    SELECT
+        crossability_group,
         -- Use ST_ClusterDBSCAN to identify connected clusters
         -- The eps parameter (2nd arg) is the max distance between features to be considered connected
         -- Setting it to 0 means features must touch or overlap
         -- The minpoints parameter (3rd arg) is the min number of points to form a cluster
         -- Setting it to 1 means even a single feature can form its own cluster
-        ST_ClusterDBSCAN(geom, 0, 1) OVER (
-            PARTITION BY 
-                CASE
-                    WHEN crossability < 20 THEN 'low'
-                    WHEN crossability < 50 THEN 'medium'
-                    ELSE 'high'
-                END
-        ) AS cluster_id,
+        ST_ClusterDBSCAN(geom, 0, 1) OVER (PARTITION BY crossability_group) AS cluster_id,
         id,
         crossability,
         buffer_rule_applied,
         crossability_rule_applied,
         buffer_size_m,
         geom
-    FROM water_buf
+    FROM grouped_buffers
 ),
 -- Group by both crossability range AND cluster ID to ensure only connected features are merged
 crossability_groups AS (
@@ -95,13 +100,17 @@ GROUP BY crossability_group, buffer_rules_applied, crossability_rules_applied, a
 ORDER BY crossability_group;
 
 -- Log cluster statistics
+-- The geodesic area is computed once per cluster and reused by each aggregate
 SELECT 
     crossability_group,
     COUNT(*) as cluster_count,
-    MIN(ST_Area(geom::geography)) / 10000 as min_cluster_area_hectares,
-    MAX(ST_Area(geom::geography)) / 10000 as max_cluster_area_hectares,
-    AVG(ST_Area(geom::geography)) / 10000 as avg_cluster_area_hectares
-FROM water_buf_dissolved
+    MIN(area_sq_m) / 10000 as min_cluster_area_hectares,
+    MAX(area_sq_m) / 10000 as max_cluster_area_hectares,
+    AVG(area_sq_m) / 10000 as avg_cluster_area_hectares
+FROM (
+    SELECT crossability_group, ST_Area(geom::geography) AS area_sq_m
+    FROM water_buf_dissolved
+) cluster_areas
 GROUP BY crossability_group
 ORDER BY crossability_group;
 
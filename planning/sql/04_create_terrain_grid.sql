@@ -35,46 +35,37 @@ FROM filtered_grid;
 -- Create spatial index
 CREATE INDEX ON terrain_grid USING GIST(geom);
 
--- Log the results
-SELECT 
-    COUNT(*) as grid_cell_count,
-    MIN(ST_Area(geom::geography)) as min_cell_area_sqm,
-    MAX(ST_Area(geom::geography)) as max_cell_area_sqm,
-    AVG(ST_Area(geom::geography)) as avg_cell_area_sqm,
-    SUM(ST_Area(geom::geography)) / 1000000 as total_area_sq_km
-FROM terrain_grid;
-
--- Compare with water buffer area
-SELECT 
-    'terrain_grid' AS source,
-    COUNT(*) as count,
-    SUM(ST_Area(geom::geography)) / 1000000 as total_area_sq_km
-FROM terrain_grid
-UNION ALL
-SELECT 
-    'water_buf_dissolved' AS source,
-    COUNT(*) as count,
-    SUM(ST_Area(geom::geography)) / 1000000 as total_area_sq_km
-FROM water_buf_dissolved;
-
--- Calculate the percentage of the total area covered by water
+-- Log the results, comparing with the water buffer area. Each cell's
+-- geodesic area is computed once, and each table is scanned once.
 WITH 
-total_area AS (
-    SELECT ST_Area(ST_SetSRID(ST_Envelope(ST_Extent(geom)), 4326)::geography) / 1000000 as area_sq_km
-    FROM water_buf_dissolved
+terrain_stats AS (
+    SELECT 
+        COUNT(*) as count,
+        MIN(area_sqm) as min_cell_area_sqm,
+        MAX(area_sqm) as max_cell_area_sqm,
+        AVG(area_sqm) as avg_cell_area_sqm,
+        SUM(area_sqm) / 1000000 as area_sq_km
+    FROM (
+        SELECT ST_Area(geom::geography) AS area_sqm
+        FROM terrain_grid
+    ) cell_areas
 ),
-water_area AS (
-    SELECT SUM(ST_Area(geom::geography)) / 1000000 as area_sq_km
+water_stats AS (
+    SELECT 
+        COUNT(*) as count,
+        SUM(ST_Area(geom::geography)) / 1000000 as area_sq_km,
+        ST_Area(ST_SetSRID(ST_Envelope(ST_Extent(geom)), 4326)::geography) / 1000000 as total_area_sq_km
     FROM water_buf_dissolved
-),
-terrain_area AS (
-    SELECT SUM(ST_Area(geom::geography)) / 1000000 as area_sq_km
-    FROM terrain_grid
 )
 SELECT 
-    total_area.area_sq_km as total_area_sq_km,
-    water_area.area_sq_km as water_area_sq_km,
-    terrain_area.area_sq_km as terrain_area_sq_km,
-    (water_area.area_sq_km / total_area.area_sq_km) * 100 as water_percentage,
-    (terrain_area.area_sq_km / total_area.area_sq_km) * 100 as terrain_percentage
-FROM total_area, water_area, terrain_area;
+    terrain_stats.count as grid_cell_count,
+    terrain_stats.min_cell_area_sqm,
+    terrain_stats.max_cell_area_sqm,
+    terrain_stats.avg_cell_area_sqm,
+    water_stats.count as water_buf_dissolved_count,
+    water_stats.total_area_sq_km,
+    water_stats.area_sq_km as water_area_sq_km,
+    terrain_stats.area_sq_km as terrain_area_sq_km,
+    (water_stats.area_sq_km / water_stats.total_area_sq_km) * 100 as water_percentage,
+    (terrain_stats.area_sq_km / water_stats.total_area_sq_km) * 100 as terrain_percentage
+FROM terrain_stats, water_stats;
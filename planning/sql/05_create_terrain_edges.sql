@@ -3,18 +3,23 @@
 -- Parameters:
 -- :connection_distance - Maximum distance in meters between connected grid cells
 
+-- Materialize the grid cell centroids with a spatial index so the
+-- ST_DWithin self-join below can use an index scan instead of a nested loop
+DROP TABLE IF EXISTS terrain_points;
+CREATE TEMP TABLE terrain_points AS
+SELECT 
+    id,
+    ST_Centroid(geom) AS geom,
+    cost
+FROM terrain_grid;
+
+CREATE INDEX ON terrain_points USING GIST(geom);
+ANALYZE terrain_points;
+
 -- Create terrain_edges table
 DROP TABLE IF EXISTS terrain_edges CASCADE;
 CREATE TABLE terrain_edges AS
 WITH 
--- Create points at the centroids of the terrain grid cells
-points AS (
-    SELECT 
-        id,
-        ST_Centroid(geom) AS geom,
-        cost
-    FROM terrain_grid
-),
 -- Create candidate edges between nearby points
 candidate_edges AS (
     SELECT 
@@ -22,8 +27,8 @@ candidate_edges AS (
         b.id AS target_id,
         (a.cost + b.cost) / 2 AS cost,
         ST_MakeLine(a.geom, b.geom) AS geom
-    FROM points a
-    JOIN points b ON ST_DWithin(a.geom, b.geom, :connection_distance) 
+    FROM terrain_points a
+    JOIN terrain_points b ON ST_DWithin(a.geom, b.geom, :connection_distance) 
     WHERE a.id < b.id -- Avoid duplicate edges
 ),
 -- Filter out edges that cross water buffers
@@ -54,6 +59,13 @@ FROM valid_edges;
 -- Create spatial index
 CREATE INDEX ON terrain_edges USING GIST(geom);
 
+-- Create node indexes for graph traversals and connectivity checks
+CREATE INDEX ON terrain_edges(source_id);
+CREATE INDEX ON terrain_edges(target_id);
+ANALYZE terrain_edges;
+
+DROP TABLE IF EXISTS terrain_points;
+
 -- Log the results
 SELECT 
     COUNT(*) as edge_count,
@@ -21,65 +21,90 @@ ON CONFLICT (condition_name) DO UPDATE
     SET value = EXCLUDED.value,
         last_updated = CURRENT_TIMESTAMP;
 
--- Create function to update water crossability based on environmental conditions
-CREATE OR REPLACE FUNCTION update_water_crossability() RETURNS VOID AS $$
+-- Create function to update water crossability based on environmental conditions.
+-- pg_proc already stores the source of the installed function, so only
+-- (re)create it when that source differs, avoiding a lock and recompile on
+-- every pipeline run
+DO $do$
 DECLARE
-    rainfall NUMERIC;
-    snow_depth NUMERIC;
-    temperature NUMERIC;
-    original_water_edges_count INTEGER;
-    updated_water_edges_count INTEGER;
-BEGIN
-    -- Get current environmental conditions
-    SELECT value INTO rainfall FROM environmental_conditions WHERE condition_name = 'rainfall';
-    SELECT value INTO snow_depth FROM environmental_conditions WHERE condition_name = 'snow_depth';
-    SELECT value INTO temperature FROM environmental_conditions WHERE condition_name = 'temperature';
+    function_source TEXT := $fn$
+    DECLARE
+        rainfall NUMERIC;
+        snow_depth NUMERIC;
+        temperature NUMERIC;
+        updated_water_edges_count INTEGER;
+    BEGIN
+        -- Get current environmental conditions in a single pass
+        SELECT 
+            MAX(value) FILTER (WHERE condition_name = 'rainfall'),
+            MAX(value) FILTER (WHERE condition_name = 'snow_depth'),
+            MAX(value) FILTER (WHERE condition_name = 'temperature')
+        INTO rainfall, snow_depth, temperature
+        FROM environmental_conditions;
     
-    -- Count original water edges
-    SELECT COUNT(*) INTO original_water_edges_count FROM water_edges;
+        -- Create a backup of the original water edges if it doesn't exist
+        IF to_regclass('water_edges_original') IS NULL THEN
+            CREATE TABLE water_edges_original AS SELECT * FROM water_edges;
+            CREATE INDEX ON water_edges_original(id);
+        END IF;
     
-    -- Create a backup of the original water edges if it doesn't exist
-    IF NOT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name = 'water_edges_original') THEN
-        CREATE TABLE water_edges_original AS SELECT * FROM water_edges;
-    END IF;
+        -- Update water edges cost based on environmental conditions, joining
+        -- the backup once instead of running a subquery per edge. Edges whose
+        -- cost is already correct (e.g. when the same conditions are applied
+        -- twice) are left alone rather than rewritten with the same value
+        UPDATE water_edges
+        SET cost = adjusted.cost
+        FROM (
+            SELECT
+                original.id,
+                CASE
+                    -- Frozen water (below freezing and no rainfall)
+                    WHEN temperature < 0 AND rainfall < 0.1 THEN 
+                        CASE
+                            -- Deep snow makes crossing harder
+                            WHEN snow_depth > 0.5 THEN original.cost * 0.8
+                            -- Frozen water with little snow is easier to cross
+                            ELSE original.cost * 0.5
+                        END
+                    -- Heavy rainfall makes crossing harder
+                    WHEN rainfall > 0.7 THEN original.cost * (1.0 + rainfall)
+                    -- Moderate rainfall
+                    WHEN rainfall > 0.3 THEN original.cost * (1.0 + (rainfall * 0.5))
+                    -- Light rainfall
+                    WHEN rainfall > 0 THEN original.cost * (1.0 + (rainfall * 0.2))
+                    -- Default - no change
+                    ELSE original.cost
+                END AS cost
+            FROM water_edges_original original
+        ) adjusted
+        WHERE adjusted.id = water_edges.id
+          AND water_edges.cost IS DISTINCT FROM adjusted.cost;
     
-    -- Update water edges cost based on environmental conditions
-    UPDATE water_edges
-    SET cost = (
-        SELECT 
-            CASE
-                -- Frozen water (below freezing and no rainfall)
-                WHEN temperature < 0 AND rainfall < 0.1 THEN 
-                    CASE
-                        -- Deep snow makes crossing harder
-                        WHEN snow_depth > 0.5 THEN original.cost * 0.8
-                        -- Frozen water with little snow is easier to cross
-                        ELSE original.cost * 0.5
-                    END
-                -- Heavy rainfall makes crossing harder
-                WHEN rainfall > 0.7 THEN original.cost * (1.0 + rainfall)
-                -- Moderate rainfall
-                WHEN rainfall > 0.3 THEN original.cost * (1.0 + (rainfall * 0.5))
-                -- Light rainfall
-                WHEN rainfall > 0 THEN original.cost * (1.0 + (rainfall * 0.2))
-                -- Default - no change
-                ELSE original.cost
-            END
-        FROM water_edges_original original
-        WHERE original.id = water_edges.id
-    );
-    
-    -- Count updated water edges
-    SELECT COUNT(*) INTO updated_water_edges_count FROM water_edges;
+        -- Count updated water edges
+        GET DIAGNOSTICS updated_water_edges_count = ROW_COUNT;
     
-    -- Log the update
-    RAISE NOTICE 'Updated water crossability with environmental factors:';
-    RAISE NOTICE '  - Rainfall: %', rainfall;
-    RAISE NOTICE '  - Snow depth: % m', snow_depth;
-    RAISE NOTICE '  - Temperature: % °C', temperature;
-    RAISE NOTICE '  - Updated % water edges', updated_water_edges_count;
-END;
-$$ LANGUAGE plpgsql;
+        -- Log the update
+        RAISE NOTICE 'Updated water crossability with environmental factors:';
+        RAISE NOTICE '  - Rainfall: %', rainfall;
+        RAISE NOTICE '  - Snow depth: % m', snow_depth;
+        RAISE NOTICE '  - Temperature: % °C', temperature;
+        RAISE NOTICE '  - Updated % water edges', updated_water_edges_count;
+    END;
+$fn$;
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_proc
+        WHERE oid = to_regprocedure('update_water_crossability()')
+          AND prosrc = function_source
+    ) THEN
+        EXECUTE format(
+            'CREATE OR REPLACE FUNCTION update_water_crossability() RETURNS VOID AS %L LANGUAGE plpgsql',
+            function_source
+        );
+    END IF;
+END
+$do$;
 
 -- Create a view to show the current environmental conditions
 CREATE OR REPLACE VIEW current_environment AS
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the stage cache of the water obstacle pipeline.
+"""
+
+import os
+import sys
+import unittest
+
+# Add the parent directory to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from scripts.run_water_obstacle_pipeline import (
+        chain_stage_hashes,
+        is_stage_reusable
+    )
+except ImportError:  # psycopg2 is not installed
+    chain_stage_hashes = is_stage_reusable = None
+
+
+STAGES = [
+    ("01_extract_water_features.sql", "CREATE TABLE water_features AS SELECT 1;"),
+    ("02_create_water_buffers.sql", "CREATE TABLE water_buf AS SELECT 2;"),
+]
+
+
+@unittest.skipIf(chain_stage_hashes is None, "run_water_obstacle_pipeline dependencies are not installed")
+class TestChainStageHashes(unittest.TestCase):
+    """Test that stage hashes cover the source data and every earlier step."""
+    
+    def test_hashes_are_stable(self):
+        """The same inputs give the same hashes."""
+        self.assertEqual(
+            chain_stage_hashes("planet_osm_line:1:10", STAGES),
+            chain_stage_hashes("planet_osm_line:1:10", STAGES)
+        )
+    
+    def test_source_fingerprint_changes_every_hash(self):
+        """A new import changes the hash of every step."""
+        old = chain_stage_hashes("planet_osm_line:1:10", STAGES)
+        new = chain_stage_hashes("planet_osm_line:2:10", STAGES)
+        for old_hash, new_hash in zip(old, new):
+            self.assertNotEqual(old_hash, new_hash)
+    
+    def test_earlier_step_changes_later_hashes(self):
+        """Changing a step's SQL changes its hash and every later one."""
+        changed = [(STAGES[0][0], STAGES[0][1] + " -- changed"), STAGES[1]]
+        old = chain_stage_hashes("", STAGES)
+        new = chain_stage_hashes("", changed)
+        self.assertNotEqual(old[0], new[0])
+        self.assertNotEqual(old[1], new[1])
+    
+    def test_later_step_keeps_earlier_hashes(self):
+        """Changing a step's SQL leaves the hashes of earlier steps alone."""
+        changed = [STAGES[0], (STAGES[1][0], STAGES[1][1] + " -- changed")]
+        old = chain_stage_hashes("", STAGES)
+        new = chain_stage_hashes("", changed)
+        self.assertEqual(old[0], new[0])
+        self.assertNotEqual(old[1], new[1])
+
+
+@unittest.skipIf(is_stage_reusable is None, "run_water_obstacle_pipeline dependencies are not installed")
+class TestIsStageReusable(unittest.TestCase):
+    """Test the decision to skip a pipeline step."""
+    
+    STAGE = "01_extract_water_features.sql"
+    
+    def test_unchanged_stage_is_reused(self):
+        """A matching hash with the same populated table is reused."""
+        self.assertTrue(is_stage_reusable(
+            self.STAGE, "abc", {self.STAGE: ("abc", 42)}, {"water_features": (42, True)}
+        ))
+    
+    def test_changed_hash_is_not_reused(self):
+        """A step whose inputs changed runs again."""
+        self.assertFalse(is_stage_reusable(
+            self.STAGE, "def", {self.STAGE: ("abc", 42)}, {"water_features": (42, True)}
+        ))
+    
+    def test_unrecorded_stage_is_not_reused(self):
+        """A step that never completed runs."""
+        self.assertFalse(is_stage_reusable(
+            self.STAGE, "abc", {}, {"water_features": (42, True)}
+        ))
+    
+    def test_missing_table_is_not_reused(self):
+        """A step whose table was dropped runs again."""
+        self.assertFalse(is_stage_reusable(
+            self.STAGE, "abc", {self.STAGE: ("abc", 42)}, {}
+        ))
+    
+    def test_empty_table_is_not_reused(self):
+        """A step whose table was emptied runs again."""
+        self.assertFalse(is_stage_reusable(
+            self.STAGE, "abc", {self.STAGE: ("abc", 42)}, {"water_features": (42, False)}
+        ))
+    
+    def test_rebuilt_table_is_not_reused(self):
+        """A table rebuilt under the same name by another pipeline is not reused."""
+        self.assertFalse(is_stage_reusable(
+            self.STAGE, "abc", {self.STAGE: ("abc", 42)}, {"water_features": (43, True)}
+        ))
+    
+    def test_untracked_table_is_not_reused(self):
+        """A run recorded without its table's OID is not reused."""
+        self.assertFalse(is_stage_reusable(
+            self.STAGE, "abc", {self.STAGE: ("abc", None)}, {"water_features": (42, True)}
+        ))
+    
+    def test_uncached_stage_is_not_reused(self):
+        """The environmental conditions step always runs."""
+        stage = "07_create_environmental_tables.sql"
+        self.assertFalse(is_stage_reusable(stage, "abc", {stage: ("abc", 42)}, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -274,8 +274,13 @@ def main():
     
     # Check if OSM tables exist
     try:
-        line_exists = pd.read_sql("SELECT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name = 'planet_osm_line')", engine).iloc[0, 0]
-        polygon_exists = pd.read_sql("SELECT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name = 'planet_osm_polygon')", engine).iloc[0, 0]
+        # One catalog lookup for both tables
+        exists_df = pd.read_sql(
+            "SELECT to_regclass('planet_osm_line') IS NOT NULL AS line_exists, "
+            "to_regclass('planet_osm_polygon') IS NOT NULL AS polygon_exists",
+            engine
+        )
+        line_exists, polygon_exists = exists_df.iloc[0]
         
         if not line_exists or not polygon_exists:
             print("Error: OSM tables not found. Make sure you have imported OSM data.", file=sys.stderr)
@@ -15,17 +15,26 @@ import sys
 import time
 from pathlib import Path
 
-# SQL for resetting only the derived tables
-RESET_DERIVED_TABLES_SQL = """
-DROP TABLE IF EXISTS road_edges CASCADE;
-DROP TABLE IF EXISTS water_polys CASCADE;
-DROP TABLE IF EXISTS water_buf CASCADE;
-DROP TABLE IF EXISTS terrain_grid CASCADE;
-DROP TABLE IF EXISTS water_edges CASCADE;
-DROP TABLE IF EXISTS terrain_edges CASCADE;
-DROP TABLE IF EXISTS unified_edges CASCADE;
-DROP TABLE IF EXISTS grid_profile CASCADE;
-"""
+# Tables built from the imported OSM data by the pipelines
+DERIVED_TABLES = [
+    "road_edges",
+    "water_polys",
+    "water_features",
+    "water_buf",
+    "water_buf_dissolved",
+    "terrain_grid",
+    "water_edges",
+    "water_edges_original",
+    "water_edges_dissolved",
+    "terrain_edges",
+    "unified_edges",
+    "grid_profile",
+    "pipeline_stage_runs",
+]
+
+# SQL for resetting only the derived tables, as one statement so they are
+# all dropped under a single set of locks
+RESET_DERIVED_TABLES_SQL = f"DROP TABLE IF EXISTS {', '.join(DERIVED_TABLES)} CASCADE;"
 
 # SQL for creating extensions
 CREATE_EXTENSIONS_SQL = """
@@ -48,19 +57,12 @@ def run_docker_command(cmd, check=True):
 
 def get_db_container_name():
     """Get the name of the PostgreSQL container."""
-    result = run_docker_command(["docker", "compose", "ps", "--services"])
+    # A single query for the db service; the output is just the container name
+    result = run_docker_command(["docker", "compose", "ps", "db", "--format", "{{.Name}}"])
     if not result or result.returncode != 0:
         return None
     
-    services = result.stdout.strip().split('\n')
-    for service in services:
-        if service == 'db':
-            # Get the actual container name
-            result = run_docker_command(["docker", "compose", "ps", "db", "--format", "{{.Name}}"])
-            if result and result.returncode == 0:
-                return result.stdout.strip()
-    
-    return None
+    return result.stdout.strip() or None
 
 def execute_sql(container_name, sql, database="gis", user="gis"):
     """Execute SQL in the PostgreSQL container."""
@@ -71,16 +73,35 @@ def execute_sql(container_name, sql, database="gis", user="gis"):
     
     return run_docker_command(cmd)
 
+def execute_sql_script(container_name, script, database="gis", user="gis"):
+    """Execute a multi-statement SQL script in a single psql session."""
+    cmd = [
+        "docker", "exec", "-i", container_name,
+        "psql", "-U", user, "-d", database, "-v", "ON_ERROR_STOP=1", "-f", "-"
+    ]
+    
+    try:
+        # Only errors on stderr are of interest; the command tags psql
+        # prints for each statement are discarded rather than buffered
+        return subprocess.run(cmd,
+                              input=script,
+                              stdout=subprocess.DEVNULL,
+                              stderr=subprocess.PIPE,
+                              text=True,
+                              check=True)
+    except subprocess.SubprocessError as e:
+        print(f"Error executing command: {e}", file=sys.stderr)
+        return None
+
 def reset_entire_database(container_name):
     """Reset the entire database."""
     print("Resetting entire database...")
     
-    # Drop and recreate the database
-    execute_sql(container_name, "DROP DATABASE IF EXISTS gis;", database="postgres")
-    execute_sql(container_name, "CREATE DATABASE gis;", database="postgres")
-    
-    # Create extensions
-    execute_sql(container_name, CREATE_EXTENSIONS_SQL)
+    # Drop and recreate the database, then reconnect to it to create the
+    # extensions, all in one psql session
+    script = "DROP DATABASE IF EXISTS gis;\nCREATE DATABASE gis;\n\\c gis\n" + CREATE_EXTENSIONS_SQL
+    if not execute_sql_script(container_name, script, database="postgres"):
+        return False
     
     print("Database reset complete.")
     return True
@@ -89,18 +110,31 @@ def reset_derived_tables(container_name):
     """Reset only the derived tables."""
     print("Resetting derived tables...")
     
-    execute_sql(container_name, RESET_DERIVED_TABLES_SQL)
+    result = execute_sql(container_name, RESET_DERIVED_TABLES_SQL)
+    if not result or result.returncode != 0:
+        return False
     
     print("Derived tables reset complete.")
     return True
 
-def import_osm_data(container_name, osm_file, use_docker=True):
+def get_osm2pgsql_tuning_args(cache_mb=None):
+    """Get osm2pgsql options that speed up a one-off import."""
+    # The database is always rebuilt with --create and never updated, so the
+    # slim tables osm2pgsql keeps for updates can be dropped after import
+    args = ["--drop", "--number-processes", str(os.cpu_count() or 1)]
+    if cache_mb:
+        args.extend(["--cache", str(cache_mb)])
+    
+    return args
+
+def import_osm_data(container_name, osm_file, use_docker=True, cache_mb=None):
     """Import OSM data using osm2pgsql."""
     if not os.path.exists(osm_file):
         print(f"Error: OSM file {osm_file} does not exist.", file=sys.stderr)
         return False
     
     print(f"Importing OSM data from {osm_file}...")
+    tuning_args = get_osm2pgsql_tuning_args(cache_mb)
     
     if use_docker:
         # Get the absolute path of the OSM file
@@ -122,6 +156,7 @@ def import_osm_data(container_name, osm_file, use_docker=True):
             "--port", "5432",
             "--password", "gis",
             "--slim", "-G",
+            *tuning_args,
             f"/data/{osm_filename}"
         ]
     else:
@@ -130,6 +165,7 @@ def import_osm_data(container_name, osm_file, use_docker=True):
             "osm2pgsql",
             "--create",
             "--slim", "-G",
+            *tuning_args,
             "-d", "gis",
             "-U", "gis",
             "-H", "localhost",
@@ -149,7 +185,7 @@ def import_osm_data(container_name, osm_file, use_docker=True):
         print(f"Error importing OSM data: {e}", file=sys.stderr)
         return False
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Reset the PostGIS database and optionally reimport OSM data.")
     
     # Reset options
@@ -161,8 +197,10 @@ def main():
     parser.add_argument("--import", dest="import_file", help="Import OSM data from the specified file")
     parser.add_argument("--local-osm2pgsql", action="store_true", 
                        help="Use local osm2pgsql instead of Docker container")
+    parser.add_argument("--osm-cache", type=int, metavar="MB",
+                       help="Node cache size in MB for osm2pgsql (default: osm2pgsql's own)")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Get the PostgreSQL container name
     container_name = get_db_container_name()
@@ -182,7 +220,8 @@ def main():
     
     # Import OSM data if specified
     if args.import_file:
-        if not import_osm_data(container_name, args.import_file, not args.local_osm2pgsql):
+        if not import_osm_data(container_name, args.import_file, not args.local_osm2pgsql,
+                               cache_mb=args.osm_cache):
             return 1
     
     return 0
@@ -2,7 +2,7 @@
 """
 Run SQL queries from a file in the PostgreSQL container.
 
-This script copies a SQL file to the Docker container and executes it.
+This script pipes a SQL file to psql in the Docker container and executes it.
 It can also execute a single query specified on the command line.
 """
 
@@ -10,12 +10,12 @@ import argparse
 import os
 import subprocess
 import sys
-import tempfile
 
-def run_docker_command(cmd, check=True):
+def run_docker_command(cmd, check=True, input=None):
     """Run a Docker command and return the result."""
     try:
         result = subprocess.run(cmd, 
+                               input=input,
                                stdout=subprocess.PIPE, 
                                stderr=subprocess.PIPE, 
                                text=True,
@@ -27,38 +27,26 @@ def run_docker_command(cmd, check=True):
 
 def get_db_container_name():
     """Get the name of the PostgreSQL container."""
-    result = run_docker_command(["docker", "compose", "ps", "--services"])
+    # A single query for the db service; the output is just the container name
+    result = run_docker_command(["docker", "compose", "ps", "db", "--format", "{{.Name}}"])
     if not result or result.returncode != 0:
         return None
     
-    services = result.stdout.strip().split('\n')
-    for service in services:
-        if service == 'db':
-            # Get the actual container name
-            result = run_docker_command(["docker", "compose", "ps", "db", "--format", "{{.Name}}"])
-            if result and result.returncode == 0:
-                return result.stdout.strip()
-    
-    return None
+    return result.stdout.strip() or None
 
 def execute_sql_file(container_name, sql_file, database="gis", user="gis"):
     """Execute a SQL file in the PostgreSQL container."""
-    # Copy the file to the container
-    container_path = f"/tmp/{os.path.basename(sql_file)}"
-    copy_cmd = ["docker", "compose", "cp", sql_file, f"db:{container_path}"]
-    copy_result = run_docker_command(copy_cmd)
-    if not copy_result or copy_result.returncode != 0:
-        print(f"Error copying SQL file to container: {copy_result.stderr if copy_result else 'Unknown error'}", file=sys.stderr)
-        return None
+    with open(sql_file, "r") as f:
+        sql = f.read()
     
-    # Execute the SQL file
+    # Pipe the file to psql on stdin rather than copying it into the container
     cmd = [
-        "docker", "exec", container_name,
-        "psql", "-U", user, "-d", database, "-f", container_path
+        "docker", "exec", "-i", container_name,
+        "psql", "-U", user, "-d", database, "-f", "-"
     ]
     
     print(f"Executing SQL file: {sql_file}")
-    result = run_docker_command(cmd, check=False)
+    result = run_docker_command(cmd, check=False, input=sql)
     
     if result:
         print(result.stdout)
@@ -15,21 +15,25 @@ import sys
 import argparse
 import logging
 import importlib.util
-import subprocess
 from pathlib import Path
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('unified_pipeline.log')
-    ]
-)
+# Logging is configured in main() once the arguments have been parsed, so
+# --help and argument errors don't open the log file
 logger = logging.getLogger('unified_pipeline')
 
 
+def configure_logging():
+    """Configure console and file logging for a pipeline run."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(),
+            logging.FileHandler('unified_pipeline.log')
+        ]
+    )
+
+
 def import_module_from_path(module_name, file_path):
     """
     Import a module from a file path.
@@ -98,16 +102,22 @@ def run_enhanced_pipeline(args):
     run_pipeline_path = os.path.join(os.path.dirname(__file__), "run_pipeline_enhanced.py")
     run_pipeline = import_module_from_path("run_pipeline_enhanced", run_pipeline_path)
     
-    # Prepare arguments for run_pipeline_enhanced.main()
-    pipeline_args = argparse.Namespace(
-        sql_dir=args.sql_dir,
-        enhanced=True,
-        export=args.export,
-        lon=args.lon,
-        lat=args.lat,
-        minutes=args.minutes,
-        output=args.output
-    )
+    # Build arguments for run_pipeline_enhanced.main()
+    pipeline_args = [
+        "--sql-dir", args.sql_dir,
+        "--enhanced",
+        "--minutes", str(args.minutes),
+        "--output", args.output
+    ]
+    
+    if args.export:
+        pipeline_args.append("--export")
+    
+    if args.lon is not None:
+        pipeline_args.extend(["--lon", str(args.lon)])
+    
+    if args.lat is not None:
+        pipeline_args.extend(["--lat", str(args.lat)])
     
     # Run the pipeline
     try:
@@ -136,35 +146,24 @@ def run_water_obstacle_pipeline(args):
     )
     run_pipeline = import_module_from_path("run_water_obstacle_pipeline", run_pipeline_path)
     
-    # Prepare arguments for run_water_obstacle_pipeline.main()
-    pipeline_args = argparse.Namespace(
-        config=args.config,
-        sql_dir=args.water_sql_dir,
-        conn_string=args.conn_string,
-        skip=args.skip,
-        verbose=args.verbose
-    )
+    # Build arguments for run_water_obstacle_pipeline.main()
+    pipeline_args = [
+        "--config", os.path.join(os.path.dirname(os.path.dirname(__file__)), args.config),
+        "--sql-dir", os.path.join(os.path.dirname(os.path.dirname(__file__)), args.water_sql_dir)
+    ]
+    
+    if args.conn_string:
+        pipeline_args.extend(["--conn-string", args.conn_string])
+    
+    if args.skip:
+        pipeline_args.extend(["--skip"] + args.skip)
+    
+    if args.verbose:
+        pipeline_args.append("--verbose")
     
     # Run the pipeline
     try:
-        # Set the command-line arguments
-        sys.argv = [
-            "run_water_obstacle_pipeline.py",
-            "--config", os.path.join(os.path.dirname(os.path.dirname(__file__)), args.config),
-            "--sql-dir", os.path.join(os.path.dirname(os.path.dirname(__file__)), args.water_sql_dir)
-        ]
-        
-        if args.conn_string:
-            sys.argv.extend(["--conn-string", args.conn_string])
-        
-        if args.skip:
-            sys.argv.extend(["--skip"] + args.skip)
-        
-        if args.verbose:
-            sys.argv.append("--verbose")
-        
-        # Run the main function
-        return run_pipeline.main()
+        return run_pipeline.main(pipeline_args)
     except Exception as e:
         logger.error(f"Error running water obstacle pipeline: {e}")
         return 1
@@ -187,10 +186,10 @@ def run_test_pipeline(args):
         os.path.dirname(os.path.dirname(__file__)),
         "planning/scripts/test_water_obstacle_pipeline.py"
     )
+    test_pipeline = import_module_from_path("test_water_obstacle_pipeline", test_pipeline_path)
     
-    # Build command
-    cmd = [
-        "python", test_pipeline_path,
+    # Build arguments for test_water_obstacle_pipeline.main()
+    test_args = [
         "--subset", args.subset,
         "--config", args.config,
         "--sql-dir", args.water_sql_dir,
@@ -198,41 +197,26 @@ def run_test_pipeline(args):
     ]
     
     if args.skip_reset:
-        cmd.append("--skip-reset")
+        test_args.append("--skip-reset")
     
     if args.skip_pipeline:
-        cmd.append("--skip-pipeline")
+        test_args.append("--skip-pipeline")
     
     if args.skip_visualization:
-        cmd.append("--skip-visualization")
+        test_args.append("--skip-visualization")
     
     if args.skip_environmental:
-        cmd.append("--skip-environmental")
+        test_args.append("--skip-environmental")
     
     if args.verbose:
-        cmd.append("--verbose")
+        test_args.append("--verbose")
     
-    # Run the command
+    # Run the test pipeline in this interpreter rather than starting a new one
     try:
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True
-        )
-        
-        logger.info(result.stdout)
-        if result.stderr:
-            logger.warning(result.stderr)
-        
-        return 0
-    
-    except subprocess.CalledProcessError as e:
+        return test_pipeline.main(test_args)
+    except Exception as e:
         logger.error(f"Error running test pipeline: {e}")
-        logger.error(f"Command output: {e.stdout}")
-        logger.error(f"Command error output: {e.stderr}")
-        return e.returncode
+        return 1
 
 
 def main():
@@ -240,6 +224,7 @@ def main():
     parser = argparse.ArgumentParser(
         description="Unified Pipeline Script",
         formatter_class=argparse.RawDescriptionHelpFormatter,
+        fromfile_prefix_chars="@",
         epilog="""
 Examples:
   # Run standard pipeline
@@ -253,6 +238,9 @@ Examples:
   
   # Run water obstacle test pipeline
   python scripts/run_unified_pipeline.py --mode test --skip-reset
+  
+  # Read arguments from a file, one per line
+  python scripts/run_unified_pipeline.py @water.args
 """
     )
     
@@ -372,6 +360,8 @@ Examples:
     
     args = parser.parse_args()
     
+    configure_logging()
+    
     # Set log level
     if args.verbose:
         logger.setLevel(logging.DEBUG)
@@ -9,17 +9,23 @@ SELECT
     ST_Boundary(geom) AS geom
 FROM water_buf;
 
+-- Materialize the grid cell centroids with a spatial index so the
+-- ST_DWithin self-join below can use an index scan instead of a nested loop
+DROP TABLE IF EXISTS terrain_points;
+CREATE TEMP TABLE terrain_points AS
+SELECT 
+    ROW_NUMBER() OVER () AS id,
+    ST_Centroid(geom) AS geom,
+    cost
+FROM terrain_grid;
+
+CREATE INDEX ON terrain_points USING GIST(geom);
+ANALYZE terrain_points;
+
 -- Create terrain_edges table from terrain_grid
 DROP TABLE IF EXISTS terrain_edges CASCADE;
 CREATE TABLE terrain_edges AS
 WITH 
-points AS (
-    SELECT 
-        ROW_NUMBER() OVER () AS id,
-        ST_Centroid(geom) AS geom,
-        cost
-    FROM terrain_grid
-),
 edges AS (
     SELECT 
         ROW_NUMBER() OVER () AS id,
@@ -27,8 +33,8 @@ edges AS (
         b.id AS target_id,
         (a.cost + b.cost) / 2 AS cost,
         ST_MakeLine(a.geom, b.geom) AS geom
-    FROM points a
-    JOIN points b ON ST_DWithin(a.geom, b.geom, 300) -- Connect points within 300m
+    FROM terrain_points a
+    JOIN terrain_points b ON ST_DWithin(a.geom, b.geom, 300) -- Connect points within 300m
     WHERE a.id < b.id -- Avoid duplicate edges
 )
 SELECT 
@@ -39,6 +45,8 @@ SELECT
     geom
 FROM edges;
 
+DROP TABLE terrain_points;
+
 -- Create indexes
 CREATE INDEX ON water_edges USING GIST(geom);
 CREATE INDEX ON terrain_edges USING GIST(geom);
@@ -16,6 +16,7 @@ import os
 import tempfile
 import uuid
 import networkx as nx
+import numpy as np
 import geopandas as gpd
 from sqlalchemy import create_engine, text
 from pathlib import Path
@@ -155,12 +156,18 @@ def slice(
     )
     """
     
-    # Use a different approach with a direct SQL query
+    # Use a different approach with a direct SQL query. The endpoint
+    # coordinates are also returned as numbers, so they don't have to be
+    # parsed back out of the WKT for every edge
     edges_query = f"""
     SELECT 
         {column_list},
         ST_AsText(ST_StartPoint(ST_Transform(geom, 4326))) AS start_point_wkt,
-        ST_AsText(ST_EndPoint(ST_Transform(geom, 4326))) AS end_point_wkt
+        ST_AsText(ST_EndPoint(ST_Transform(geom, 4326))) AS end_point_wkt,
+        ST_X(ST_StartPoint(ST_Transform(geom, 4326))) AS start_x,
+        ST_Y(ST_StartPoint(ST_Transform(geom, 4326))) AS start_y,
+        ST_X(ST_EndPoint(ST_Transform(geom, 4326))) AS end_x,
+        ST_Y(ST_EndPoint(ST_Transform(geom, 4326))) AS end_y
         {', ST_AsText(ST_Transform(geom, 4326)) AS geom_wkt' if include_geometry else ''}
     FROM unified_edges 
     WHERE ST_Intersects(
@@ -199,60 +206,39 @@ def slice(
         print("Creating NetworkX graph...")
         G = nx.DiGraph()
         
-        # Add nodes with positions
-        nodes = {}
-        for _, row in edges.iterrows():
-            # Skip edges with None values for start_point_wkt or end_point_wkt
-            if pd.isna(row.start_point_wkt) or pd.isna(row.end_point_wkt):
-                continue
-                
-            # Extract coordinates from start point
-            start_wkt = str(row.start_point_wkt)
-            if not start_wkt.startswith('POINT('):
-                continue
-            start_coords = start_wkt.replace("POINT(", "").replace(")", "").split()
-            start_x, start_y = float(start_coords[0]), float(start_coords[1])
-            
-            # Extract coordinates from end point
-            end_wkt = str(row.end_point_wkt)
-            if not end_wkt.startswith('POINT('):
-                continue
-            end_coords = end_wkt.replace("POINT(", "").replace(")", "").split()
-            end_x, end_y = float(end_coords[0]), float(end_coords[1])
-            
-            # Use source and target IDs from the unified_edges table if available
-            source_id = f"node_{row.source}" if 'source' in row and not pd.isna(row.source) else f"node_{hash(start_wkt)}"
-            target_id = f"node_{row.target}" if 'target' in row and not pd.isna(row.target) else f"node_{hash(end_wkt)}"
-            
-            # Add nodes if they don't exist
-            if source_id not in nodes:
-                nodes[source_id] = (start_x, start_y)
-            
-            if target_id not in nodes:
-                nodes[target_id] = (end_x, end_y)
+        # Skip edges with None values for start_point_wkt or end_point_wkt,
+        # or with empty start or end points, which have no coordinates
+        valid = edges[
+            edges.start_point_wkt.notna() & edges.end_point_wkt.notna()
+            & edges.start_x.notna() & edges.end_x.notna()
+        ]
         
-        # Add nodes to the graph with positions
-        for node_id, pos in nodes.items():
-            G.add_node(node_id, x=pos[0], y=pos[1])
+        # Use source and target IDs from the unified_edges table if available,
+        # computed for all edges at once rather than row by row
+        def node_ids(ids, wkts):
+            fallback = "node_" + wkts.astype(str).map(hash).astype(str)
+            return ("node_" + ids.astype(str)).where(ids.notna(), fallback)
+        
+        source_ids = node_ids(valid.source, valid.start_point_wkt)
+        target_ids = node_ids(valid.target, valid.end_point_wkt)
+        
+        # Add nodes with positions, keeping the first position seen for each
+        # node in edge order (source before target)
+        positions = pd.DataFrame({
+            'x': np.column_stack([valid.start_x, valid.end_x]).ravel(),
+            'y': np.column_stack([valid.start_y, valid.end_y]).ravel(),
+        }, index=np.column_stack([source_ids, target_ids]).ravel())
+        positions = positions[~positions.index.duplicated()]
+        G.add_nodes_from(
+            (node_id, {'x': x, 'y': y})
+            for node_id, x, y in zip(positions.index, positions.x.tolist(), positions.y.tolist())
+        )
         
         # Add edges with all attributes
-        for _, row in edges.iterrows():
-            # Skip edges with None values for start_point_wkt or end_point_wkt
-            if pd.isna(row.start_point_wkt) or pd.isna(row.end_point_wkt):
-                continue
-                
-            # Skip edges with invalid start or end points
-            start_wkt = str(row.start_point_wkt)
-            end_wkt = str(row.end_point_wkt)
-            if not start_wkt.startswith('POINT(') or not end_wkt.startswith('POINT('):
-                continue
-                
-            # Use source and target IDs from the unified_edges table if available
-            source_id = f"node_{row.source}" if 'source' in row and not pd.isna(row.source) else f"node_{hash(start_wkt)}"
-            target_id = f"node_{row.target}" if 'target' in row and not pd.isna(row.target) else f"node_{hash(end_wkt)}"
-            
-            # Convert row to dictionary and remove unnecessary columns
-            edge_attrs = row.to_dict()
+        for source_id, target_id, edge_attrs in zip(source_ids, target_ids, valid.to_dict('records')):
+            # Remove unnecessary columns
+            for col in ['start_x', 'start_y', 'end_x', 'end_y']:
+                edge_attrs.pop(col, None)  # Already stored as the node positions
             for col in ['start_point_wkt', 'end_point_wkt', 'source', 'target']:
                 if col in edge_attrs:
                     edge_attrs[col] = str(edge_attrs[col])  # Convert to string for GraphML compatibility
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Logging Utilities
+
+This module provides a shared way to configure loggers for the terrain system
+scripts, so each logger is set up once with a dated log file under output/logs
+and, unless the root logger already writes to the console, a console handler.
+"""
+
+import datetime
+import functools
+import logging
+import logging.handlers
+import multiprocessing
+from typing import Dict, Optional, Tuple
+
+from utils.file_management import get_log_path
+
+
+DEFAULT_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# DEFAULT_LOG_FORMAT doesn't use source locations, thread, or process
+# information, so skip collecting them for every log record
+logging._srcfile = None
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# Loggers that have already been configured, by name
+_CONFIGURED: Dict[str, logging.Logger] = {}
+
+
+@functools.lru_cache(maxsize=32)
+def _get_formatter(format_str: str = DEFAULT_LOG_FORMAT) -> logging.Formatter:
+    """Get the shared formatter for a format string."""
+    return logging.Formatter(format_str)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_dated_log_path(log_description: str, date: datetime.date) -> str:
+    """Get the log file path for a description on a date; the date only keys the cache."""
+    return get_log_path(log_description)
+
+
+def _get_log_path(log_description: str) -> str:
+    """Get today's log file path for a description, creating its directory once a day."""
+    return _get_dated_log_path(log_description, datetime.date.today())
+
+
+def setup_logger(
+    name: str,
+    log_description: Optional[str] = None,
+    level: int = logging.INFO
+) -> logging.Logger:
+    """
+    Configure a logger with a console handler and an optional log file.
+
+    A logger that already has handlers is returned unchanged, so calling this
+    more than once never stacks duplicate handlers. Records still propagate
+    to the root logger, so when a script that configured root logging (such
+    as the test harness) imports this one, the console handler is left out
+    and each record is printed once, by the root's handlers.
+
+    Args:
+        name: Name of the logger
+        log_description: Description used for the log file name; no log file
+            is written if this is None
+        level: Logging level
+
+    Returns:
+        logging.Logger: The configured logger
+    """
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger
+
+    logger.setLevel(level)
+    formatter = _get_formatter(DEFAULT_LOG_FORMAT)
+
+    if not logging.getLogger().handlers:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+        logger.addHandler(stream_handler)
+
+    if log_description:
+        file_handler = logging.FileHandler(_get_log_path(log_description))
+        file_handler.setFormatter(formatter)
+        logger.addHandler(file_handler)
+
+    return logger
+
+
+def get_logger(
+    name: str,
+    log_description: Optional[str] = None,
+    level: int = logging.INFO
+) -> logging.Logger:
+    """
+    Get a configured logger, setting it up on first use.
+
+    Args:
+        name: Name of the logger
+        log_description: Description used for the log file name
+        level: Logging level used when the logger is first configured
+
+    Returns:
+        logging.Logger: The configured logger
+    """
+    logger = _CONFIGURED.get(name)
+    if logger is None:
+        logger = setup_logger(name, log_description, level)
+        _CONFIGURED[name] = logger
+
+    return logger
+
+
+def start_log_listener(
+    logger: logging.Logger
+) -> Tuple["multiprocessing.Queue", logging.handlers.QueueListener]:
+    """
+    Start passing records from worker processes to a logger's handlers.
+
+    Workers install the returned queue with use_log_queue, so their records
+    are written by this process alone rather than by every worker through
+    its own copy of the handlers.
+
+    Args:
+        logger: Logger whose handlers should receive the workers' records
+
+    Returns:
+        Tuple of (queue, listener); call listener.stop() once the workers
+        have finished
+    """
+    log_queue = multiprocessing.Queue()
+    listener = logging.handlers.QueueListener(
+        log_queue, *logger.handlers, respect_handler_level=True
+    )
+    listener.start()
+    return log_queue, listener
+
+
+def use_log_queue(name: str, log_queue: "multiprocessing.Queue") -> None:
+    """
+    Send a logger's records to a queue instead of its own handlers.
+
+    Intended as a worker process initializer, paired with start_log_listener
+    in the parent. The inherited handlers are detached without being closed,
+    since the files and streams they write to belong to the parent.
+
+    Args:
+        name: Name of the logger
+        log_queue: Queue returned by start_log_listener
+    """
+    logger = logging.getLogger(name)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
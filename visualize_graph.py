@@ -8,24 +8,20 @@ This script loads a GraphML file and creates a visualization of the graph.
 import os
 import sys
 import argparse
-import logging
 import networkx as nx
+import matplotlib
+# Figures are only ever saved to files, so skip loading an interactive backend
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from pathlib import Path
 from utils.file_management import get_visualization_path
+from utils.logging_utils import get_logger
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('output/logs/visualization.log')
-    ]
-)
-logger = logging.getLogger('graph_visualization')
+logger = get_logger('graph_visualization', "visualization")
 
-def visualize_graph(input_file, output_file=None, title=None, dpi=300, show_labels=False):
+def visualize_graph(input_file, output_file=None, title=None, dpi=300, show_labels=False,
+                    show_arrows=False):
     """
     Visualize a GraphML file.
     
@@ -35,6 +31,7 @@ def visualize_graph(input_file, output_file=None, title=None, dpi=300, show_labe
         title: Title for the visualization (optional)
         dpi: DPI for the output image (optional)
         show_labels: Whether to show node labels (optional)
+        show_arrows: Whether to draw arrowheads on directed edges (optional)
     
     Returns:
         Path to the saved visualization
@@ -47,7 +44,7 @@ def visualize_graph(input_file, output_file=None, title=None, dpi=300, show_labe
     logger.info(f"Graph loaded with {len(G.nodes)} nodes and {len(G.edges)} edges")
     
     # Create the figure
-    plt.figure(figsize=(12, 10))
+    fig = plt.figure(figsize=(12, 10))
     
     # Set the title
     if title:
@@ -66,10 +63,12 @@ def visualize_graph(input_file, output_file=None, title=None, dpi=300, show_labe
         logger.warning("No position attributes found in the graph. Using spring layout.")
         pos = nx.spring_layout(G)
     
-    # Draw the graph
+    # Draw the graph. Arrowheads need a separate patch per edge, so by
+    # default the edges are drawn as a single line collection instead
     nx.draw(
         G,
         pos=pos,
+        arrows=show_arrows,
         with_labels=show_labels,
         node_size=50,
         node_color='skyblue',
@@ -95,6 +94,9 @@ def visualize_graph(input_file, output_file=None, title=None, dpi=300, show_labe
     plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
     logger.info(f"Visualization saved to {output_file}")
     
+    # Close the figure to free memory
+    plt.close(fig)
+    
     return output_file
 
 def main():
@@ -105,6 +107,8 @@ def main():
     parser.add_argument("--title", help="Title for the visualization")
     parser.add_argument("--dpi", type=int, default=300, help="DPI for the output image")
     parser.add_argument("--show-labels", action="store_true", help="Show node labels")
+    parser.add_argument("--show-arrows", action="store_true",
+                        help="Draw arrowheads on directed edges (slower for large graphs)")
     
     args = parser.parse_args()
     
@@ -114,7 +118,8 @@ def main():
             args.output,
             args.title,
             args.dpi,
-            args.show_labels
+            args.show_labels,
+            args.show_arrows
         )
         
         print(f"Visualization saved to {output_file}")
@@ -11,23 +11,14 @@ This script provides a unified interface for all visualization operations:
 import os
 import sys
 import argparse
-import logging
 import importlib.util
-import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from utils.file_management import get_visualization_path, get_log_path
+from utils.file_management import get_visualization_path
+from utils.logging_utils import get_logger, start_log_listener, use_log_queue
 
 # Configure logging
-log_path = get_log_path("unified_visualization")
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(log_path)
-    ]
-)
-logger = logging.getLogger('unified_visualization')
+logger = get_logger('unified_visualization', "unified_visualization")
 
 
 def import_module_from_path(module_name, file_path):
@@ -96,10 +87,12 @@ def visualize_water(args):
         os.path.dirname(__file__),
         "planning/scripts/visualize_water_obstacles.py"
     )
+    visualize_water_obstacles = import_module_from_path(
+        "visualize_water_obstacles", visualize_water_path
+    )
     
-    # Build command
-    cmd = [
-        "python", visualize_water_path,
+    # Build arguments for visualize_water_obstacles.main()
+    water_args = [
         "--output", args.output if args.output else get_visualization_path(
             viz_type='water',
             description='water_obstacles',
@@ -109,32 +102,14 @@ def visualize_water(args):
     ]
     
     if args.title:
-        cmd.extend(["--title", args.title])
-    
-    if args.show_labels:
-        cmd.append("--show-labels")
+        water_args.extend(["--title", args.title])
     
-    # Run the command
+    # Run the visualization in this interpreter rather than starting a new one
     try:
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True
-        )
-        
-        logger.info(result.stdout)
-        if result.stderr:
-            logger.warning(result.stderr)
-        
-        return 0
-    
-    except subprocess.CalledProcessError as e:
+        return visualize_water_obstacles.main(water_args)
+    except Exception as e:
         logger.error(f"Error visualizing water obstacles: {e}")
-        logger.error(f"Command output: {e.stdout}")
-        logger.error(f"Command error output: {e.stderr}")
-        return e.returncode
+        return 1
 
 
 def visualize_combined(args):
@@ -149,14 +124,28 @@ def visualize_combined(args):
     """
     logger.info("Creating combined visualization")
     
-    # First, visualize the GraphML file
-    graphml_result = visualize_graphml(args)
+    # The GraphML and water obstacle plots don't depend on each other, so
+    # render them side by side; pyplot isn't thread-safe, hence processes.
+    # The workers hand their log records to this process to write
+    log_queue, listener = start_log_listener(logger)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=2,
+            initializer=use_log_queue,
+            initargs=(logger.name, log_queue)
+        ) as executor:
+            graphml_future = executor.submit(visualize_graphml, args)
+            water_future = executor.submit(visualize_water, args)
+            
+            graphml_result = graphml_future.result()
+            water_result = water_future.result()
+    finally:
+        listener.stop()
+    
     if graphml_result != 0:
         logger.error("Failed to visualize GraphML file")
         return graphml_result
     
-    # Then, visualize the water obstacles
-    water_result = visualize_water(args)
     if water_result != 0:
         logger.error("Failed to visualize water obstacles")
         return water_result